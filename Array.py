@@ -1,23 +1,32 @@
 import array
-from ctypes import (Structure, c_int, c_void_p, c_size_t, c_double, c_long, POINTER, CDLL)
+import os
+from ctypes import (Structure, c_int, c_void_p, c_size_t, c_double, c_long, POINTER, CDLL, cast,
+                    addressof, string_at, RTLD_LOCAL)
 from typing import NoReturn, List, Union
-import atexit
 
 
-lib = CDLL("/Users/egorrudenko/CLionProjects/aads1/libtest.so")
+# библиотека лежит рядом с модулем: путь не привязан к машине разработчика
+_LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "libtest.so")
 
+# границы значения c_long на 64-битных платформах; раньше проверка
+# сравнивала с INT32_MAX, что не соответствовало реальной ширине long,
+# а нижней границы не было вовсе
+_LONG_MAX = 2 ** 63 - 1
+_LONG_MIN = -2 ** 63
 
-class Element(Structure):
-    """Equals C-structure Element"""
-
-    _fields_ = [("type", c_int),
-                ("data", c_void_p)]
+lib = CDLL(_LIB_PATH, mode=RTLD_LOCAL, use_errno=False)
 
 
 class CArray(Structure):
-    """Equals C-structure Array"""
+    """Equals C-structure Array
 
-    _fields_ = [("array", POINTER(Element)),
+    Note:
+        Теги типов и значения хранятся в двух параллельных упакованных буферах
+        (structure-of-arrays), а не в массиве тегированных структур Element
+    """
+
+    _fields_ = [("types", POINTER(c_int)),
+                ("values", c_void_p),
                 ("used", c_size_t),
                 ("size", c_size_t)]
 
@@ -36,6 +45,100 @@ class DoublePopResult(Structure):
                 ("result", c_double)]
 
 
+def _configure(lib) -> NoReturn:
+    """Настраивает argtypes/restype всех Си-функций один раз при импорте модуля
+
+    Note:
+        Раньше этот блок выполнялся в Array.__init__ на каждом создании объекта
+
+    Parameters:
+        lib: CDLL
+            Загруженная Си-библиотека
+    """
+
+    lib.initArray.argtypes = [c_void_p, c_int]
+    lib.freeArray.argtypes = [c_void_p]
+    lib.insertInt.argtypes = [c_void_p, c_int]
+    lib.insertDouble.argtypes = [c_void_p, c_double]
+    lib.insertLong.argtypes = [c_void_p, c_long]
+    lib.printArray.argtypes = [c_void_p]
+    lib.getArrayLength.argtypes = [c_void_p]
+    lib.returnType.argtypes = [c_void_p, c_int]
+    lib.returnInt.argtypes = [c_void_p, c_int]
+    lib.returnDouble.argtypes = [c_void_p, c_int]
+    lib.returnLong.argtypes = [c_void_p, c_int]
+    lib.insertLongToPos.argtypes = [c_void_p, c_long]
+    lib.insertDoubleToPos.argtypes = [c_void_p, c_double]
+    lib.binarySearchLong.argtypes = [c_void_p, c_long]
+    lib.binarySearchDouble.argtypes = [c_void_p, c_double]
+    lib.removeLong.argtypes = [c_void_p, c_long]
+    lib.removeDouble.argtypes = [c_void_p, c_double]
+    lib.removeManyLong.argtypes = [c_void_p, POINTER(c_long), c_size_t]
+    lib.removeManyDouble.argtypes = [c_void_p, POINTER(c_double), c_size_t]
+    lib.insertLongAtPos.argtypes = [c_void_p, c_long, c_int]
+    lib.insertDoubleAtPos.argtypes = [c_void_p, c_double, c_int]
+    lib.popLong.argtypes = [c_void_p, c_int, c_void_p]
+    lib.popDouble.argtypes = [c_void_p, c_int, c_void_p]
+    lib.insertLongBulk.argtypes = [c_void_p, POINTER(c_long), c_size_t]
+    lib.insertDoubleBulk.argtypes = [c_void_p, POINTER(c_double), c_size_t]
+    lib.arraysEqual.argtypes = [c_void_p, c_void_p]
+    lib.bufferEqualsLong.argtypes = [c_void_p, POINTER(c_long), c_size_t]
+    lib.bufferEqualsDouble.argtypes = [c_void_p, POINTER(c_double), c_size_t]
+    lib.getDataPointer.argtypes = [c_void_p]
+
+    lib.getArrayLength.restype = c_size_t
+    lib.getDataPointer.restype = c_void_p
+    lib.returnInt.restype = c_int
+    lib.returnDouble.restype = c_double
+    lib.returnLong.restype = c_long
+    lib.returnType.restype = c_int
+    lib.binarySearchLong.restype = c_int
+    lib.binarySearchDouble.restype = c_int
+    lib.removeLong.restype = c_int
+    lib.removeManyLong.restype = c_size_t
+    lib.removeManyDouble.restype = c_size_t
+    lib.popLong.restype = c_int
+    lib.popDouble.restype = c_int
+
+
+_configure(lib)
+
+
+def _load_cffi(path: str):
+    """Опционально загружает библиотеку еще раз через cffi в ABI-режиме
+
+    Путь вызова cffi заметно дешевле ctypes, поэтому при наличии пакета cffi
+    горячие функции переключаются на него; без cffi остается чистый ctypes.
+    Аргумент Array* объявлен как uintptr_t, чтобы передавать готовый адрес
+    структуры тем же числом, что и в ctypes-вызовах
+
+    Parameters:
+        path: str
+            Путь к Си-библиотеке
+
+    Returns:
+        value: FFI-объект и загруженная библиотека, либо (None, None)
+    """
+
+    try:
+        from cffi import FFI
+    except ImportError:
+        return None, None
+    ffi = FFI()
+    ffi.cdef("""
+        size_t getArrayLength(uintptr_t a);
+        int returnType(uintptr_t a, int pos);
+        long returnLong(uintptr_t a, int pos);
+        double returnDouble(uintptr_t a, int pos);
+        void insertLong(uintptr_t a, long value);
+        void insertDouble(uintptr_t a, double value);
+    """)
+    return ffi, ffi.dlopen(path)
+
+
+_cffi_ffi, _cffi_lib = _load_cffi(_LIB_PATH)
+
+
 class Array:
     """Класс Array позволяет работать с модулем на Си, реализующим хранение данных в массиве
 
@@ -70,12 +173,46 @@ class Array:
             Метод для бинарного поиска, массив заранее сортируется
         remove(value: Union[int, float])
             Метод для удаления элемента из списка, без возврата
+        remove_many(values: List[Union[int, float]])
+            Метод для удаления нескольких значений за один проход по массиву
         append(arg: Union[int, float])
             Метод для вставки элемента в конец списка
         insert(pos: int, arg: Union[int, float])
             Метод для вставки элемента в указанную позицию по индексу
+        tolist()
+            Метод для выгрузки массива в обычный список Python
     """
 
+    # Ссылки на Си-функции кэшируются на уровне класса, чтобы не искать
+    # атрибуты lib.<name> при каждом вызове метода
+    _initArray = lib.initArray
+    _freeArray = lib.freeArray
+    _insertInt = lib.insertInt
+    _insertDouble = lib.insertDouble
+    _insertLong = lib.insertLong
+    _getArrayLength = lib.getArrayLength
+    _returnType = lib.returnType
+    _returnDouble = lib.returnDouble
+    _returnLong = lib.returnLong
+    _insertLongToPos = lib.insertLongToPos
+    _insertDoubleToPos = lib.insertDoubleToPos
+    _binarySearchLong = lib.binarySearchLong
+    _binarySearchDouble = lib.binarySearchDouble
+    _removeLong = lib.removeLong
+    _removeDouble = lib.removeDouble
+    _removeManyLong = lib.removeManyLong
+    _removeManyDouble = lib.removeManyDouble
+    _insertLongAtPos = lib.insertLongAtPos
+    _insertDoubleAtPos = lib.insertDoubleAtPos
+    _popLong = lib.popLong
+    _popDouble = lib.popDouble
+    _insertLongBulk = lib.insertLongBulk
+    _insertDoubleBulk = lib.insertDoubleBulk
+    _getDataPointer = lib.getDataPointer
+    _arraysEqual = lib.arraysEqual
+    _bufferEqualsLong = lib.bufferEqualsLong
+    _bufferEqualsDouble = lib.bufferEqualsDouble
+
     def __init__(self, typecode: str, initializer: List[Union[int, float]] = None) -> None:
 
         if not (typecode in ["i", "d", "a"]):
@@ -84,59 +221,86 @@ class Array:
             # a -> multiple types (any)
             raise TypeError("[Array] Unsupported typecode")
 
-        lib.initArray.argtypes = [POINTER(CArray), c_int]
-        lib.freeArray.argtypes = [POINTER(CArray)]
-        lib.insertInt.argtypes = [POINTER(CArray), c_int]
-        lib.insertDouble.argtypes = [POINTER(CArray), c_double]
-        lib.insertLong.argtypes = [POINTER(CArray), c_long]
-        lib.printArray.argtypes = [POINTER(CArray)]
-        lib.getArrayLength.argtypes = [POINTER(CArray)]
-        lib.returnType.argtypes = [POINTER(CArray), c_int]
-        lib.returnInt.argtypes = [POINTER(CArray), c_int]
-        lib.returnDouble.argtypes = [POINTER(CArray), c_int]
-        lib.returnLong.argtypes = [POINTER(CArray), c_int]
-        lib.insertLongToPos.argtypes = [POINTER(CArray), c_long]
-        lib.insertDoubleToPos.argtypes = [POINTER(CArray), c_double]
-        lib.binarySearchLong.argtypes = [POINTER(CArray), c_long]
-        lib.binarySearchDouble.argtypes = [POINTER(CArray), c_double]
-        lib.removeLong.argtypes = [POINTER(CArray), POINTER(CArray), c_long]
-        lib.removeDouble.argtypes = [POINTER(CArray), POINTER(CArray), c_double]
-        lib.insertLongAtPos.argtypes = [POINTER(CArray), POINTER(CArray), c_long, c_int]
-        lib.insertDoubleAtPos.argtypes = [POINTER(CArray), POINTER(CArray), c_double, c_int]
-        lib.popLong.argtypes = [POINTER(CArray), POINTER(CArray), c_int]
-        lib.popDouble.argtypes = [POINTER(CArray), POINTER(CArray), c_int]
-
-        lib.getArrayLength.restype = c_size_t
-        lib.returnInt.restype = c_int
-        lib.returnDouble.restype = c_double
-        lib.returnLong.restype = c_long
-        lib.returnType.restype = c_int
-        lib.binarySearchLong.restype = c_int
-        lib.binarySearchDouble.restype = c_int
-        lib.removeLong.restype = c_int
-        lib.popLong.restype = LongPopResult
-        lib.popDouble.restype = DoublePopResult
-
         self.array = CArray()
+        # адрес структуры фиксируется один раз; ctypes передает готовое число
+        # вместо того чтобы оборачивать структуру в POINTER на каждом вызове
+        self._addr = addressof(self.array)
         self.typecode = typecode
+        # Python-сторонний счетчик длины: все мутации идут через методы класса,
+        # поэтому len() не обязан каждый раз пересекать границу ctypes
+        self._length = 0
+
+        # для однородных массивов тип элементов известен заранее, поэтому
+        # геттер, сеттер и append выбираются один раз здесь, а не на каждом вызове
+        if typecode == "i":
+            self._getter = self._returnLong
+            self._setter = self._insertLongToPos
+            self.append = self.__append_long
+        elif typecode == "d":
+            self._getter = self._returnDouble
+            self._setter = self._insertDoubleToPos
+            self.append = self.__append_double
+        else:
+            self._getter = None
+            self._setter = None
+            self.append = self.__append_any
+
+        # переиспользуемая структура результата pop: ctypes-объект создается
+        # один раз, а не на каждый вызов
+        if typecode == "i":
+            self._pop_result = LongPopResult()
+        elif typecode == "d":
+            self._pop_result = DoublePopResult()
+        else:
+            self._pop_result = None
+        self._pop_addr = addressof(self._pop_result) if self._pop_result is not None else None
 
         if initializer and (initializer != []):
-            lib.initArray(self.array, len(initializer))
-            for element in initializer:
-                self.append(element)
+            self._initArray(self._addr, len(initializer))
+            if self.typecode in ("i", "d"):
+                self.__init_bulk(initializer)
+            else:
+                for element in initializer:
+                    self.append(element)
         else:
-            lib.initArray(self.array, 1)  # empty arr initialization
+            self._initArray(self._addr, 1)  # empty arr initialization
+
+    def __del__(self) -> NoReturn:
+        """Деструктор, освобождает Си-память при сборке мусора
+
+        Note:
+            Заменяет прежнюю регистрацию в atexit: память возвращается сразу
+            когда объект удален, а не при завершении интерпретатора
+        """
 
-        atexit.register(self.__free)
+        try:
+            self.__free()
+        except Exception:
+            pass  # завершение интерпретатора могло уже разрушить модуль
+
+    def __enter__(self) -> "Array":
+        """Метод для входа в контекстный менеджер
+
+            Returns:
+                value: Array
+                    Сам объект массива
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Метод для выхода из контекстного менеджера, освобождает Си-память"""
+
+        self.__free()
 
     def __len__(self) -> int:
-        """Метод для получения длины списка, вызывает функцию в модуле Си
+        """Метод для получения длины списка, возвращает счетчик без вызова Си
 
             Returns:
                 value: int
                     Значение длины списка
         """
-        return int(lib.getArrayLength(self.array))
+        return self._length
 
     def __getitem__(self, pos: int) -> Union[int, float]:
         """Метод для получения значения элемента списка по его индексу
@@ -157,11 +321,13 @@ class Array:
         """
 
         self.__index_error_handler(pos)
-        el_type = lib.returnType(self.array, pos)
+        if self._getter is not None:
+            return self._getter(self._addr, pos)
+        el_type = self._returnType(self._addr, pos)
         if el_type == 0:  # et_long
-            return lib.returnLong(self.array, pos)
+            return self._returnLong(self._addr, pos)
         elif el_type == 1:  # et_dbl
-            return lib.returnDouble(self.array, pos)
+            return self._returnDouble(self._addr, pos)
         else:
             raise ValueError("[Array] Unexpected error")
 
@@ -178,11 +344,10 @@ class Array:
         """
 
         self.__index_error_handler(key)
-        self.__overflow_error_handler(value)
-        if self.typecode == "i":
-            lib.insertLongToPos(self.array, value, key)
-        elif self.typecode == "d":
-            lib.insertDoubleToPos(self.array, value, key)
+        if value > _LONG_MAX or value < _LONG_MIN:
+            raise OverflowError("[Array] Variable overflow")
+        if self._setter is not None:
+            self._setter(self._addr, value, key)
 
     def __str__(self) -> str:
         """Метод для строкового вывода массива, переопределяет принт
@@ -191,7 +356,49 @@ class Array:
             value: str
                 Строковое представление массива
         """
-        return f"{[i for i in self]}"
+        return f"{self.__as_list()}"
+
+    def __as_list(self) -> List[Union[int, float]]:
+        """Приватный метод для выгрузки всех элементов одним чтением буфера
+
+        Для однородных массивов читает упакованный Си-буфер напрямую через
+        from_address, без ctypes-вызова на каждый элемент
+
+        Returns:
+            value: List[Union[int, float]]
+                Список значений элементов массива
+        """
+
+        count = self._length
+        if count == 0 or self.typecode == "a":
+            return [self[i] for i in range(count)]
+        address = self._getDataPointer(self._addr)
+        buf = array.array("q" if self.typecode == "i" else "d")
+        buf.frombytes(string_at(address, count * buf.itemsize))
+        return buf.tolist()
+
+    def __iter__(self):
+        """Метод для итерации по массиву
+
+        Снимает все элементы одним чтением Си-буфера вместо вызова
+        __getitem__ на каждом шаге
+
+            Returns:
+                value: iterator
+                    Итератор по значениям элементов
+        """
+
+        return iter(self.__as_list())
+
+    def tolist(self) -> List[Union[int, float]]:
+        """Метод для выгрузки массива в обычный список Python
+
+            Returns:
+                value: List[Union[int, float]]
+                    Список значений элементов массива
+        """
+
+        return self.__as_list()
 
     def __eq__(self, other: array.array) -> bool:
         """Метод для проверки объектов на эквивалентность
@@ -204,6 +411,35 @@ class Array:
             value: bool
                 True - эквивалентны; False - разные
         """
+        if isinstance(other, Array):
+            return bool(self._arraysEqual(self._addr, other._addr))
+        if self.typecode == "a":
+            return self.__eq_elementwise(other)
+        try:
+            buf = array.array("q" if self.typecode == "i" else "d", other)
+        except (TypeError, OverflowError):
+            # элементы не упаковываются в буфер (другой тип, переполнение) -
+            # оператор сравнения не должен падать, сравниваем поэлементно
+            return self.__eq_elementwise(other)
+        address, count = buf.buffer_info()
+        if self.typecode == "i":
+            return bool(self._bufferEqualsLong(self._addr, cast(address, POINTER(c_long)), count))
+        return bool(self._bufferEqualsDouble(self._addr, cast(address, POINTER(c_double)), count))
+
+    def __eq_elementwise(self, other) -> bool:
+        """Приватный метод для поэлементного сравнения с произвольной последовательностью
+
+        Parameters:
+            other: sequence
+                Последовательность для сравнения
+
+        Returns:
+            value: bool
+                True - эквивалентны; False - разные
+        """
+
+        if len(self) != len(other):
+            return False
         for i in range(len(self)):
             if self[i] != other[i]:
                 return False
@@ -212,7 +448,7 @@ class Array:
     def pop(self, pos: int = -1) -> Union[int, float]:
         """Метод удаляет элемент из массива с возвратом
 
-        Создает новый массив, освобождает старый
+        Удаляет элемент на месте, без копирования массива
 
             Parameters:
                 pos: int, optional
@@ -227,17 +463,14 @@ class Array:
                     Если индекс выходит за пределы массива
         """
 
-        result = None
-        temp = CArray()
-        lib.initArray(temp, 1)
+        res = 0
         if self.typecode == "i":
-            result = lib.popLong(self.array, temp, pos)
+            res = self._popLong(self._addr, pos, self._pop_addr)
         elif self.typecode == "d":
-            result = lib.popDouble(self.array, temp, pos)
-        if result.resultCode:
-            self.__free()
-            self.array = temp
-            return result.result
+            res = self._popDouble(self._addr, pos, self._pop_addr)
+        if res:
+            self._length -= 1
+            return self._pop_result.result
         raise IndexError(f"[Array] Index {pos} out of range")
 
     def search(self, arg: Union[int, float]) -> Union[int, float]:
@@ -258,9 +491,9 @@ class Array:
         """
         pos = -1
         if self.typecode == "i":
-            pos = lib.binarySearchLong(self.array, arg)
+            pos = self._binarySearchLong(self._addr, arg)
         elif self.typecode == "d":
-            pos = lib.binarySearchDouble(self.array, arg)
+            pos = self._binarySearchDouble(self._addr, arg)
         if pos == -1:
             raise ValueError(f"[Array] Value {arg} not found")
         return pos
@@ -278,15 +511,16 @@ class Array:
                     Если индекс выходит за пределы массива
         """
 
-        if self.__len__() == 0:
+        length = self._length
+        if length == 0:
             raise IndexError("[Array] Array is empty")
-        if (pos < -self.__len__()) or (pos >= self.__len__()):
+        if (pos < -length) or (pos >= length):
             raise IndexError(f"[Array] Index {pos} out of range")
 
     def remove(self, value: Union[int, float]) -> NoReturn:
         """Метод для удаления элемента из списка, без возврата
 
-        Создает новый массив, освобождает старый
+        Удаляет элемент на месте, без копирования массива
 
         Parameters:
             value: Union[int, float]
@@ -298,58 +532,123 @@ class Array:
 
         """
 
-        res = 0
-        temp = CArray()
-        lib.initArray(temp, 1)
+        res = -1
         if self.typecode == "i":
-            res = lib.removeLong(self.array, temp, value)
+            res = self._removeLong(self._addr, value)
         elif self.typecode == "d":
-            res = lib.removeDouble(self.array, temp, value)
+            res = self._removeDouble(self._addr, value)
         if res == -1:
             raise ValueError(f"[Array] Value {value} not found")
-        self.__free()
-        self.array = temp
+        self._length -= 1
+
+    def remove_many(self, values: List[Union[int, float]]) -> int:
+        """Метод для удаления нескольких значений за один проход по массиву
+
+        Удаляет все вхождения каждого из переданных значений одним вызовом
+        Си-функции, вместо K отдельных вызовов remove
+
+        Parameters:
+            values: List[Union[int, float]]
+                Значения элементов которые будут удалены
+
+        Returns:
+            value: int
+                Количество удаленных элементов
+
+        Raises:
+            ValueError
+                Если ни одно из значений не найдено в массиве
+        """
+
+        removed = 0
+        if self.typecode in ("i", "d"):
+            buf = array.array("q" if self.typecode == "i" else "d", values)
+            address, count = buf.buffer_info()
+            if self.typecode == "i":
+                removed = self._removeManyLong(self._addr, cast(address, POINTER(c_long)), count)
+            else:
+                removed = self._removeManyDouble(self._addr, cast(address, POINTER(c_double)), count)
+        if not removed:
+            raise ValueError(f"[Array] Values {values} not found")
+        self._length -= removed
+        return removed
+
+    def __append_long(self, arg: int) -> NoReturn:
+        """Метод для вставки элемента в конец списка с typecode "i"
 
-    def append(self, arg: Union[int, float]) -> NoReturn:
-        """Метод для вставки элемента в конец списка
+        Привязывается к self.append в конструкторе, без диспетчеризации
+        по typecode на каждый вызов
+
+            Parameters:
+                arg: int
+                    Значение элемента
+
+            Raises:
+                TypeError
+                    Если передан не int
+        """
+
+        if isinstance(arg, int):
+            self.__insert_long(arg)
+        else:
+            raise TypeError(f"[Array] Expected type: int, got {arg} instead")
+
+    def __append_double(self, arg: Union[int, float]) -> NoReturn:
+        """Метод для вставки элемента в конец списка с typecode "d"
+
+        Привязывается к self.append в конструкторе, без диспетчеризации
+        по typecode на каждый вызов
 
             Parameters:
                 arg: Union[int, float]
-                    Значение элемента (int/float)
+                    Значение элемента
+
+            Raises:
+                TypeError
+                    Если передан не int/float
+        """
+
+        if isinstance(arg, (int, float)):
+            self.__insert_double(arg)
+        else:
+            raise TypeError(f"[Array] Expected types: (int, float), got {arg} instead")
+
+    def __append_any(self, arg: Union[int, float, list]) -> NoReturn:
+        """Метод для вставки элемента в конец списка с typecode "a"
+
+            Parameters:
+                arg: Union[int, float, list]
+                    Значение элемента (int/float) или список значений
 
             Note:
                 Начата реализация для массива с произвольными типами, но не функционирует нормально
 
             Raises:
                 TypeError
-                    Если typecode массива не равен типу переданного значения
+                    Если тип переданного значения не поддерживается
         """
 
-        if self.typecode == "a":
-            if isinstance(arg, int):
-                self.__insert_long(arg)
-            elif isinstance(arg, float):
-                self.__insert_double(arg)
-            elif isinstance(arg, list):
-                for element in arg:
-                    self.append(element)
-            else:
-                raise TypeError("[Array] Unexpected type")
-        elif self.typecode == "i":
-            if isinstance(arg, int):
-                self.__insert_long(arg)
-            else:
-                raise TypeError(f"[Array] Expected type: int, got {arg} instead")
-        elif self.typecode == "d":
-            if isinstance(arg, (int, float)):
-                self.__insert_double(arg)
-            else:
-                raise TypeError(f"[Array] Expected types: (int, float), got {arg} instead")
+        try:
+            handler = _APPEND_DISPATCH[type(arg)]
+        except KeyError:
+            raise TypeError("[Array] Unexpected type") from None
+        handler(self, arg)
+
+    def __append_many(self, arg: list) -> NoReturn:
+        """Метод для вставки списка элементов в конец массива с typecode "a"
+
+            Parameters:
+                arg: list
+                    Список значений элементов
+        """
+
+        for element in arg:
+            self.append(element)
 
     def insert(self, pos: int, arg: Union[int, float]) -> NoReturn:
         """Метод для вставки элемента в указанную позицию по индексу
 
-        Создает новый массив, освобождает старый
+        Вставляет элемент на месте, без копирования массива
 
         Parameters:
             pos: int
@@ -359,16 +658,32 @@ class Array:
 
         """
 
-        temp = CArray()
-        lib.initArray(temp, 1)
-
         if self.typecode == "i":
-            lib.insertLongAtPos(self.array, temp, arg, pos)
+            self._insertLongAtPos(self._addr, arg, pos)
+            self._length += 1
         elif self.typecode == "d":
-            lib.insertDoubleAtPos(self.array, temp, arg, pos)
+            self._insertDoubleAtPos(self._addr, arg, pos)
+            self._length += 1
 
-        self.__free()
-        self.array = temp
+    def __init_bulk(self, initializer: List[Union[int, float]]) -> NoReturn:
+        """Приватный метод для массовой инициализации однородного массива
+
+        Собирает элементы в непрерывный буфер array.array и передает его в Си
+        одним вызовом insertLongBulk/insertDoubleBulk вместо вызова append
+        на каждый элемент
+
+        Parameters:
+            initializer: List[Union[int, float]]
+                Список значений для инициализации
+        """
+
+        buf = array.array("q" if self.typecode == "i" else "d", initializer)
+        address, count = buf.buffer_info()
+        if self.typecode == "i":
+            self._insertLongBulk(self._addr, cast(address, POINTER(c_long)), count)
+        else:
+            self._insertDoubleBulk(self._addr, cast(address, POINTER(c_double)), count)
+        self._length += count
 
     def __insert_int(self, arg: int) -> NoReturn:
         """Метод для запуска Си-функции insertInt + проверка на перегруз
@@ -381,8 +696,10 @@ class Array:
                 Значение элемента
         """
 
-        self.__overflow_error_handler(arg)
-        lib.insertInt(self.array, arg)
+        if arg > _LONG_MAX or arg < _LONG_MIN:
+            raise OverflowError("[Array] Variable overflow")
+        self._insertInt(self._addr, arg)
+        self._length += 1
 
     def __insert_double(self, arg: float) -> NoReturn:
         """Метод для запуска Си-функции insertDouble
@@ -392,7 +709,8 @@ class Array:
                 Значение элемента
         """
 
-        lib.insertDouble(self.array, arg)
+        self._insertDouble(self._addr, arg)
+        self._length += 1
 
     def __insert_long(self, arg: int) -> NoReturn:
         """Метод для запуска Си-функции insertLong + проверка на overflow
@@ -402,31 +720,41 @@ class Array:
                 Значение элемента
         """
 
-        self.__overflow_error_handler(arg)
-        lib.insertLong(self.array, arg)
+        if arg > _LONG_MAX or arg < _LONG_MIN:
+            raise OverflowError("[Array] Variable overflow")
+        self._insertLong(self._addr, arg)
+        self._length += 1
 
     def __free(self) -> NoReturn:
         """Метод для освобождения памяти, запускает Си-функцию free
 
         Note:
-            С помощью atexit запускается при закрытии скрипта
+            Вызывается из __del__ / __exit__; Си-сторона обнуляет указатели,
+            поэтому повторный вызов безопасен
         """
-        lib.freeArray(self.array)
+        self._freeArray(self._addr)
+        self._length = 0
 
-    @staticmethod
-    def __overflow_error_handler(arg: int) -> NoReturn:
-        """Статический метод для проверки на overflow числа типа long
 
-        Parameters:
-            arg: int
-                Значение
 
-        Raises:
-            OverflowError
-                Если макс значение превышено
-        """
-        if arg > 2147483647:
-            raise OverflowError("[Array] Variable overflow")
+# таблица диспетчеризации для typecode "a": выбор обработчика по типу
+# значения за O(1) вместо цепочки isinstance-проверок
+_APPEND_DISPATCH = {
+    int: Array._Array__insert_long,
+    bool: Array._Array__insert_long,
+    float: Array._Array__insert_double,
+    list: Array._Array__append_many,
+}
+
+
+if _cffi_lib is not None:
+    # горячие функции идут через cffi, остальные остаются на ctypes
+    Array._getArrayLength = _cffi_lib.getArrayLength
+    Array._returnType = _cffi_lib.returnType
+    Array._returnLong = _cffi_lib.returnLong
+    Array._returnDouble = _cffi_lib.returnDouble
+    Array._insertLong = _cffi_lib.insertLong
+    Array._insertDouble = _cffi_lib.insertDouble
 
 
 if __name__ == '__main__':
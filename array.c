@@ -0,0 +1,481 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "array.h"
+
+#define unlikely(x) __builtin_expect(!!(x), 0)
+
+/* normalize a (possibly negative) python-style index, -1 if out of range */
+static int normalizePos(const Array *a, int pos)
+{
+    if (pos < 0)
+        pos += (int) a->used;
+    if (pos < 0 || (size_t) pos >= a->used)
+        return -1;
+    return pos;
+}
+
+/* double the capacity when full so N appends cost O(log N) reallocations */
+static void growFor(Array *a, size_t extra)
+{
+    if (a->used + extra <= a->size)
+        return;
+    while (a->used + extra > a->size)
+        a->size = a->size ? a->size * 2 : 1;
+    a->types = realloc(a->types, a->size * sizeof(int));
+    a->values = realloc(a->values, a->size * sizeof(Value));
+}
+
+static void pushValue(Array *a, int type, Value value)
+{
+    growFor(a, 1);
+    a->types[a->used] = type;
+    a->values[a->used] = value;
+    a->used++;
+}
+
+void initArray(Array *a, int initialSize)
+{
+    if (initialSize < 1)
+        initialSize = 1;
+    a->types = malloc((size_t) initialSize * sizeof(int));
+    a->values = malloc((size_t) initialSize * sizeof(Value));
+    a->used = 0;
+    a->size = (size_t) initialSize;
+}
+
+void freeArray(Array *a)
+{
+    /* idempotent: the python side may free both explicitly and from __del__ */
+    if (a->types == NULL && a->values == NULL)
+        return;
+    free(a->types);
+    free(a->values);
+    a->types = NULL;
+    a->values = NULL;
+    a->used = a->size = 0;
+}
+
+void insertInt(Array *a, int value)
+{
+    Value v = {0};
+
+    v.i = value;
+    pushValue(a, et_int, v);
+}
+
+void insertLong(Array *a, long value)
+{
+    Value v;
+
+    v.l = value;
+    pushValue(a, et_long, v);
+}
+
+void insertDouble(Array *a, double value)
+{
+    Value v;
+
+    v.d = value;
+    pushValue(a, et_dbl, v);
+}
+
+void insertLongBulk(Array *a, const long *values, size_t count)
+{
+    growFor(a, count);
+    memcpy(&a->values[a->used], values, count * sizeof(Value));
+    for (size_t i = 0; i < count; i++)
+        a->types[a->used + i] = et_long;
+    a->used += count;
+}
+
+void insertDoubleBulk(Array *a, const double *values, size_t count)
+{
+    growFor(a, count);
+    memcpy(&a->values[a->used], values, count * sizeof(Value));
+    for (size_t i = 0; i < count; i++)
+        a->types[a->used + i] = et_dbl;
+    a->used += count;
+}
+
+/* address of the packed values buffer, for zero-copy reads from python */
+void *getDataPointer(const Array *a)
+{
+    return a->values;
+}
+
+size_t getArrayLength(const Array *a)
+{
+    return a->used;
+}
+
+int returnType(const Array *a, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (pos < 0)
+        return -1;
+    return a->types[pos];
+}
+
+int returnInt(const Array *a, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (unlikely(pos < 0))
+        return 0;
+    return a->values[pos].i;
+}
+
+long returnLong(const Array *a, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (unlikely(pos < 0))
+        return 0;
+    return a->values[pos].l;
+}
+
+double returnDouble(const Array *a, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (unlikely(pos < 0))
+        return 0.0;
+    return a->values[pos].d;
+}
+
+void insertLongToPos(Array *a, long value, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (pos < 0)
+        return;
+    a->types[pos] = et_long;
+    a->values[pos].l = value;
+}
+
+void insertDoubleToPos(Array *a, double value, int pos)
+{
+    pos = normalizePos(a, pos);
+    if (pos < 0)
+        return;
+    a->types[pos] = et_dbl;
+    a->values[pos].d = value;
+}
+
+/* exact comparison matching python's int == float semantics: promoting the
+ * long to double would collapse distinct values above 2^53 */
+static int longEqualsDouble(long l, double d)
+{
+    if (d != d)                                         /* NaN */
+        return 0;
+    if (d < -9223372036854775808.0 || d >= 9223372036854775808.0)
+        return 0;
+    if ((double) (long) d != d)                         /* fractional part */
+        return 0;
+    return (long) d == l;
+}
+
+static int elementsEqual(const Array *a, size_t i, const Array *b, size_t j)
+{
+    int ta = a->types[i], tb = b->types[j];
+
+    if (ta == et_dbl && tb == et_dbl)
+        return a->values[i].d == b->values[j].d;
+    if (ta != et_dbl && tb != et_dbl) {
+        long la = (ta == et_int) ? a->values[i].i : a->values[i].l;
+        long lb = (tb == et_int) ? b->values[j].i : b->values[j].l;
+
+        return la == lb;
+    }
+    if (ta == et_dbl)
+        return longEqualsDouble((tb == et_int) ? b->values[j].i : b->values[j].l,
+                                a->values[i].d);
+    return longEqualsDouble((ta == et_int) ? a->values[i].i : a->values[i].l,
+                            b->values[j].d);
+}
+
+int arraysEqual(const Array *a, const Array *b)
+{
+    if (a->used != b->used)
+        return 0;
+    /* element-wise value comparison: bitwise memcmp would treat -0.0 as
+     * unequal to 0.0 and NaN as equal to itself */
+    for (size_t i = 0; i < a->used; i++) {
+        if (!elementsEqual(a, i, b, i))
+            return 0;
+    }
+    return 1;
+}
+
+int bufferEqualsLong(const Array *a, const long *values, size_t count)
+{
+    if (a->used != count)
+        return 0;
+    /* longs compare exactly, so the bitwise fast path is safe here */
+    return memcmp(a->values, values, count * sizeof(long)) == 0;
+}
+
+int bufferEqualsDouble(const Array *a, const double *values, size_t count)
+{
+    if (a->used != count)
+        return 0;
+    for (size_t i = 0; i < count; i++) {
+        if (a->values[i].d != values[i])
+            return 0;
+    }
+    return 1;
+}
+
+static int compareLongs(const void *lhs, const void *rhs)
+{
+    long a = ((const Value *) lhs)->l;
+    long b = ((const Value *) rhs)->l;
+
+    if (a < b)
+        return -1;
+    if (a > b)
+        return 1;
+    return 0;
+}
+
+static int compareDoubles(const void *lhs, const void *rhs)
+{
+    double a = ((const Value *) lhs)->d;
+    double b = ((const Value *) rhs)->d;
+
+    if (a < b)
+        return -1;
+    if (a > b)
+        return 1;
+    return 0;
+}
+
+static int isSortedLongs(const Array *a)
+{
+    for (size_t i = 1; i < a->used; i++) {
+        if (a->values[i - 1].l > a->values[i].l)
+            return 0;
+    }
+    return 1;
+}
+
+static int isSortedDoubles(const Array *a)
+{
+    for (size_t i = 1; i < a->used; i++) {
+        if (a->values[i - 1].d > a->values[i].d)
+            return 0;
+    }
+    return 1;
+}
+
+__attribute__((hot)) int binarySearchLong(Array *a, long key)
+{
+    size_t base = 0, len = a->used;
+
+    if (len == 0)
+        return -1;
+    if (!isSortedLongs(a))
+        qsort(a->values, a->used, sizeof(Value), compareLongs);
+    /* branchless half-interval search: the ternary compiles to a cmov */
+    while (len > 1) {
+        size_t half = len / 2;
+
+        base = (a->values[base + half - 1].l < key) ? base + half : base;
+        len -= half;
+    }
+    return (a->values[base].l == key) ? (int) base : -1;
+}
+
+__attribute__((hot)) int binarySearchDouble(Array *a, double key)
+{
+    size_t base = 0, len = a->used;
+
+    if (len == 0)
+        return -1;
+    if (!isSortedDoubles(a))
+        qsort(a->values, a->used, sizeof(Value), compareDoubles);
+    while (len > 1) {
+        size_t half = len / 2;
+
+        base = (a->values[base + half - 1].d < key) ? base + half : base;
+        len -= half;
+    }
+    return (a->values[base].d == key) ? (int) base : -1;
+}
+
+/* shrink the buffers only when mostly empty to avoid realloc churn */
+static void shrinkIfSparse(Array *a)
+{
+    if (a->size > 1 && a->used <= a->size / 4) {
+        a->size /= 2;
+        a->types = realloc(a->types, a->size * sizeof(int));
+        a->values = realloc(a->values, a->size * sizeof(Value));
+    }
+}
+
+static void removeAt(Array *a, size_t pos)
+{
+    memmove(&a->types[pos], &a->types[pos + 1],
+            (a->used - pos - 1) * sizeof(int));
+    memmove(&a->values[pos], &a->values[pos + 1],
+            (a->used - pos - 1) * sizeof(Value));
+    a->used--;
+    shrinkIfSparse(a);
+}
+
+__attribute__((hot)) int removeLong(Array *a, long value)
+{
+    for (size_t i = 0; i < a->used; i++) {
+        if (a->types[i] == et_long && a->values[i].l == value) {
+            removeAt(a, i);
+            return (int) i;
+        }
+    }
+    return -1;
+}
+
+__attribute__((hot)) int removeDouble(Array *a, double value)
+{
+    for (size_t i = 0; i < a->used; i++) {
+        if (a->types[i] == et_dbl && a->values[i].d == value) {
+            removeAt(a, i);
+            return (int) i;
+        }
+    }
+    return -1;
+}
+
+static int containsLong(const long *values, size_t count, long v)
+{
+    for (size_t i = 0; i < count; i++) {
+        if (values[i] == v)
+            return 1;
+    }
+    return 0;
+}
+
+static int containsDouble(const double *values, size_t count, double v)
+{
+    for (size_t i = 0; i < count; i++) {
+        if (values[i] == v)
+            return 1;
+    }
+    return 0;
+}
+
+/* filter out every occurrence of the given values in one pass */
+__attribute__((hot)) size_t removeManyLong(Array *a, const long *values, size_t count)
+{
+    size_t kept = 0;
+
+    for (size_t i = 0; i < a->used; i++) {
+        if (a->types[i] == et_long && containsLong(values, count, a->values[i].l))
+            continue;
+        a->types[kept] = a->types[i];
+        a->values[kept] = a->values[i];
+        kept++;
+    }
+    size_t removed = a->used - kept;
+
+    a->used = kept;
+    shrinkIfSparse(a);
+    return removed;
+}
+
+__attribute__((hot)) size_t removeManyDouble(Array *a, const double *values, size_t count)
+{
+    size_t kept = 0;
+
+    for (size_t i = 0; i < a->used; i++) {
+        if (a->types[i] == et_dbl && containsDouble(values, count, a->values[i].d))
+            continue;
+        a->types[kept] = a->types[i];
+        a->values[kept] = a->values[i];
+        kept++;
+    }
+    size_t removed = a->used - kept;
+
+    a->used = kept;
+    shrinkIfSparse(a);
+    return removed;
+}
+
+/* insert position may equal used (append); clamp like python's list.insert */
+static int normalizeInsertPos(const Array *a, int pos)
+{
+    if (pos < 0)
+        pos += (int) a->used;
+    if (pos < 0)
+        pos = 0;
+    if ((size_t) pos > a->used)
+        pos = (int) a->used;
+    return pos;
+}
+
+static void insertValueAtPos(Array *a, int type, Value value, int pos)
+{
+    pos = normalizeInsertPos(a, pos);
+    growFor(a, 1);
+    memmove(&a->types[pos + 1], &a->types[pos],
+            (a->used - (size_t) pos) * sizeof(int));
+    memmove(&a->values[pos + 1], &a->values[pos],
+            (a->used - (size_t) pos) * sizeof(Value));
+    a->types[pos] = type;
+    a->values[pos] = value;
+    a->used++;
+}
+
+void insertLongAtPos(Array *a, long value, int pos)
+{
+    Value v;
+
+    v.l = value;
+    insertValueAtPos(a, et_long, v, pos);
+}
+
+void insertDoubleAtPos(Array *a, double value, int pos)
+{
+    Value v;
+
+    v.d = value;
+    insertValueAtPos(a, et_dbl, v, pos);
+}
+
+/* fill a caller-owned result struct so the python side can reuse one */
+int popLong(Array *a, int pos, LongPopResult *out)
+{
+    out->resultCode = 0;
+    pos = normalizePos(a, pos);
+    if (pos < 0)
+        return 0;
+    out->result = a->values[pos].l;
+    removeAt(a, (size_t) pos);
+    out->resultCode = 1;
+    return 1;
+}
+
+int popDouble(Array *a, int pos, DoublePopResult *out)
+{
+    out->resultCode = 0;
+    pos = normalizePos(a, pos);
+    if (pos < 0)
+        return 0;
+    out->result = a->values[pos].d;
+    removeAt(a, (size_t) pos);
+    out->resultCode = 1;
+    return 1;
+}
+
+void printArray(const Array *a)
+{
+    printf("[");
+    for (size_t i = 0; i < a->used; i++) {
+        if (i > 0)
+            printf(", ");
+        if (a->types[i] == et_dbl)
+            printf("%f", a->values[i].d);
+        else if (a->types[i] == et_int)
+            printf("%d", a->values[i].i);
+        else
+            printf("%ld", a->values[i].l);
+    }
+    printf("]\n");
+}
@@ -0,0 +1,76 @@
+#ifndef AADS1_ARRAY_H
+#define AADS1_ARRAY_H
+
+#include <stddef.h>
+
+typedef enum {
+    et_long = 0,
+    et_dbl = 1,
+    et_int = 2
+} ElementType;
+
+/* every element payload is one 8-byte slot in the packed values buffer */
+typedef union {
+    long l;
+    double d;
+    int i;
+} Value;
+
+/* structure-of-arrays: type tags and values live in two parallel buffers */
+typedef struct {
+    int *types;
+    Value *values;
+    size_t used;
+    size_t size;
+} Array;
+
+typedef struct {
+    int resultCode;
+    long result;
+} LongPopResult;
+
+typedef struct {
+    int resultCode;
+    double result;
+} DoublePopResult;
+
+void initArray(Array *a, int initialSize);
+void freeArray(Array *a);
+
+void insertInt(Array *a, int value);
+void insertLong(Array *a, long value);
+void insertDouble(Array *a, double value);
+void insertLongBulk(Array *a, const long *values, size_t count);
+void insertDoubleBulk(Array *a, const double *values, size_t count);
+
+void *getDataPointer(const Array *a);
+size_t getArrayLength(const Array *a);
+int returnType(const Array *a, int pos);
+int returnInt(const Array *a, int pos);
+long returnLong(const Array *a, int pos);
+double returnDouble(const Array *a, int pos);
+
+void insertLongToPos(Array *a, long value, int pos);
+void insertDoubleToPos(Array *a, double value, int pos);
+
+int arraysEqual(const Array *a, const Array *b);
+int bufferEqualsLong(const Array *a, const long *values, size_t count);
+int bufferEqualsDouble(const Array *a, const double *values, size_t count);
+
+int binarySearchLong(Array *a, long key);
+int binarySearchDouble(Array *a, double key);
+
+int removeLong(Array *a, long value);
+int removeDouble(Array *a, double value);
+size_t removeManyLong(Array *a, const long *values, size_t count);
+size_t removeManyDouble(Array *a, const double *values, size_t count);
+
+void insertLongAtPos(Array *a, long value, int pos);
+void insertDoubleAtPos(Array *a, double value, int pos);
+
+int popLong(Array *a, int pos, LongPopResult *out);
+int popDouble(Array *a, int pos, DoublePopResult *out);
+
+void printArray(const Array *a);
+
+#endif